@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark comparing the TodoList durability modes.
+
+Each tenant is driven by its own thread which adds tasks and waits for
+every add to become durable before issuing the next one, the same way the
+API holds mutation responses. Run from the repository root:
+
+    python -m benchmarks.bench_durability --tenants 16 --ops 200
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from typing import Dict
+
+from src.storage import DurabilityMode, GroupCommitWriter
+from src.todo_list import TodoList
+
+def run_mode(mode: DurabilityMode, tenants: int, ops: int, interval: float) -> Dict:
+    """Run the workload for one durability mode and return its results."""
+    writer = GroupCommitWriter(interval) if mode is DurabilityMode.GROUP else None
+    with tempfile.TemporaryDirectory() as data_dir:
+        todo_lists = [
+            TodoList(f"{data_dir}/tenant{i}_tasks.json", durability=mode, group_writer=writer)
+            for i in range(tenants)
+        ]
+
+        def drive(todo_list: TodoList) -> None:
+            for i in range(ops):
+                todo_list.add_task(f"Task {i}", "Benchmark task")
+                todo_list.commit_future().result()
+
+        threads = [threading.Thread(target=drive, args=(todo_list,)) for todo_list in todo_lists]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        if writer is not None:
+            writer.close()
+
+    total = tenants * ops
+    return {
+        'mode': mode.value,
+        'ops': total,
+        'seconds': elapsed,
+        'ops_per_sec': total / elapsed,
+        'mean_latency_ms': elapsed / ops * 1000,
+    }
+
+def main():
+    """Main entry point for the durability benchmark."""
+    parser = argparse.ArgumentParser(description='Durability mode throughput benchmark')
+    parser.add_argument('--tenants', type=int, default=16, help='Number of concurrent tenants')
+    parser.add_argument('--ops', type=int, default=200, help='Mutations per tenant')
+    parser.add_argument('--interval-ms', type=float, default=5.0,
+                        help='Group commit interval in milliseconds')
+    parser.add_argument('--modes', nargs='+', default=[m.value for m in DurabilityMode],
+                        choices=[m.value for m in DurabilityMode], help='Modes to benchmark')
+    args = parser.parse_args()
+
+    print(f"{'mode':10} {'ops':>8} {'seconds':>9} {'ops/sec':>10} {'latency ms':>11}")
+    for mode in args.modes:
+        result = run_mode(DurabilityMode(mode), args.tenants, args.ops, args.interval_ms / 1000)
+        print(f"{result['mode']:10} {result['ops']:8d} {result['seconds']:9.2f} "
+              f"{result['ops_per_sec']:10.1f} {result['mean_latency_ms']:11.2f}")
+
+if __name__ == '__main__':
+    main()
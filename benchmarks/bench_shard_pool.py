@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the tenant-sharded worker pool.
+
+Tenants are preloaded with many tasks, then ``list_tasks`` requests are
+spread across them so that JSON encoding dominates. Throughput is measured
+for increasing pool sizes to show how it scales with cores. Run from the
+repository root:
+
+    python -m benchmarks.bench_shard_pool --tenants 32 --tasks 2000
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from src.shard_pool import ShardPool
+from src.todo_list import TodoList
+
+def preload(data_dir: str, tenants: int, tasks: int) -> None:
+    """Create task files for every tenant."""
+    for i in range(tenants):
+        todo_list = TodoList(os.path.join(data_dir, f"tenant{i}_tasks.json"))
+        todo_list.tasks = [
+            {'id': n, 'title': f"Task {n}", 'description': "x" * 200, 'status': "pending",
+             'created_at': "2024-01-01T00:00:00", 'modified_at': "2024-01-01T00:00:00",
+             'completed_at': None}
+            for n in range(1, tasks + 1)
+        ]
+        todo_list._save_tasks()
+
+def run_pool(data_dir: str, workers: int, tenants: int, requests: int, window: int) -> float:
+    """Return list requests per second for a pool of the given size."""
+    pool = ShardPool(workers, data_dir)
+    try:
+        # Warm every tenant so loading from disk is not measured.
+        for i in range(tenants):
+            pool.submit(f"tenant{i}", 'list_tasks').result()
+
+        slots = threading.Semaphore(window)
+        done = threading.Event()
+        remaining = [requests]
+        lock = threading.Lock()
+
+        def finished(_):
+            slots.release()
+            with lock:
+                remaining[0] -= 1
+                if not remaining[0]:
+                    done.set()
+
+        start = time.perf_counter()
+        for n in range(requests):
+            slots.acquire()
+            pool.submit(f"tenant{n % tenants}", 'list_tasks').add_done_callback(finished)
+        done.wait()
+        return requests / (time.perf_counter() - start)
+    finally:
+        pool.close()
+
+def main():
+    """Main entry point for the shard pool benchmark."""
+    parser = argparse.ArgumentParser(description='Shard pool scaling benchmark')
+    parser.add_argument('--tenants', type=int, default=32, help='Number of tenants')
+    parser.add_argument('--tasks', type=int, default=2000, help='Tasks per tenant')
+    parser.add_argument('--requests', type=int, default=2000, help='List requests per run')
+    parser.add_argument('--window', type=int, default=64, help='Maximum requests in flight')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+                        help='Pool sizes to benchmark')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        preload(data_dir, args.tenants, args.tasks)
+        print(f"{'workers':>7} {'req/sec':>10} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            rate = run_pool(data_dir, workers, args.tenants, args.requests, args.window)
+            baseline = baseline or rate
+            print(f"{workers:7d} {rate:10.1f} {rate / baseline:7.2f}x")
+
+if __name__ == '__main__':
+    main()
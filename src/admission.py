@@ -0,0 +1,152 @@
+"""Per-tenant admission control and load shedding for the API."""
+
+import math
+import threading
+import time
+from typing import Callable, Dict
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def level(self) -> float:
+        """Return the number of tokens currently available."""
+        self._refill()
+        return self.tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available; otherwise return seconds until they will be."""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the reason and a retry delay."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+class AdmissionController:
+    """Admits mutations per tenant and sheds load when the server is saturated.
+
+    Each tenant gets a token bucket and a cap on in-flight mutations. On
+    top of that, every mutation is shed while the global number of
+    in-flight mutations or the smoothed mutation latency is over its
+    threshold. A limit of 0 disables that check.
+
+    Per-tenant state is swept every ``prune_interval`` seconds: tenants
+    with nothing in flight and a full bucket are forgotten, since a full
+    bucket behaves exactly like a new one. Their shed counts still add to
+    the global totals.
+    """
+
+    def __init__(self, rate: float = 0, burst: float = 0,
+                 max_inflight_per_tenant: int = 0, max_queue_depth: int = 0,
+                 max_latency: float = 0, prune_interval: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst or rate
+        self.max_inflight_per_tenant = max_inflight_per_tenant
+        self.max_queue_depth = max_queue_depth
+        self.max_latency = max_latency
+        self.prune_interval = prune_interval
+        self._clock = clock
+        self._pruned = clock()
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._inflight: Dict[str, int] = {}
+        self._tenant_shed: Dict[str, int] = {}
+        self._shed = {'rate_limited': 0, 'tenant_concurrency': 0, 'queue_depth': 0, 'latency': 0}
+        self.total_inflight = 0
+        self.latency = 0.0
+
+    def admit(self, tenant_id: str) -> float:
+        """Admit a mutation for a tenant and return its start time.
+
+        Raises AdmissionRejected if the request should be shed.
+        """
+        with self._lock:
+            self._maybe_prune()
+            if self.max_queue_depth and self.total_inflight >= self.max_queue_depth:
+                self._reject(tenant_id, 'queue_depth', self.latency or 1)
+            # Only trust the latency signal while there is work it describes,
+            # otherwise shedding everything would keep it high forever.
+            if self.max_latency and self.total_inflight and self.latency > self.max_latency:
+                self._reject(tenant_id, 'latency', self.latency)
+            inflight = self._inflight.get(tenant_id, 0)
+            if self.max_inflight_per_tenant and inflight >= self.max_inflight_per_tenant:
+                self._reject(tenant_id, 'tenant_concurrency', 1)
+            if self.rate:
+                bucket = self._buckets.get(tenant_id)
+                if bucket is None:
+                    bucket = self._buckets[tenant_id] = TokenBucket(self.rate, self.burst, self._clock)
+                wait = bucket.try_acquire()
+                if wait:
+                    self._reject(tenant_id, 'rate_limited', wait)
+            self._inflight[tenant_id] = inflight + 1
+            self.total_inflight += 1
+            return self._clock()
+
+    def release(self, tenant_id: str, started: float) -> None:
+        """Record that an admitted mutation has finished."""
+        with self._lock:
+            remaining = self._inflight[tenant_id] - 1
+            if remaining:
+                self._inflight[tenant_id] = remaining
+            else:
+                del self._inflight[tenant_id]
+            self.total_inflight -= 1
+            # Exponentially weighted moving average of mutation latency
+            self.latency += 0.2 * ((self._clock() - started) - self.latency)
+
+    def stats(self) -> Dict:
+        """Return bucket levels, in-flight counts and shed counts of active tenants."""
+        with self._lock:
+            self._maybe_prune()
+            tenants = set(self._buckets) | set(self._inflight) | set(self._tenant_shed)
+            return {
+                'inflight': self.total_inflight,
+                'latency_ms': self.latency * 1000,
+                'shed': dict(self._shed),
+                'tenants': {
+                    tenant_id: {
+                        'tokens': self._buckets[tenant_id].level() if tenant_id in self._buckets else None,
+                        'inflight': self._inflight.get(tenant_id, 0),
+                        'shed': self._tenant_shed.get(tenant_id, 0),
+                    }
+                    for tenant_id in sorted(tenants)
+                },
+            }
+
+    def _maybe_prune(self) -> None:
+        now = self._clock()
+        if now - self._pruned < self.prune_interval:
+            return
+        self._pruned = now
+        for tenant_id in set(self._buckets) | set(self._tenant_shed):
+            if tenant_id in self._inflight:
+                continue
+            bucket = self._buckets.get(tenant_id)
+            if bucket is None or bucket.level() >= bucket.burst:
+                self._buckets.pop(tenant_id, None)
+                self._tenant_shed.pop(tenant_id, None)
+
+    def _reject(self, tenant_id: str, reason: str, retry_after: float) -> None:
+        self._shed[reason] += 1
+        self._tenant_shed[tenant_id] = self._tenant_shed.get(tenant_id, 0) + 1
+        raise AdmissionRejected(reason, retry_after)
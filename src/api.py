@@ -1,22 +1,61 @@
 """
 FastAPI application for Todo API with JWT authentication.
 """
+import asyncio
+import hmac
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
 import os
-from src.todo_list import TodoList
-from src.operations.base import TaskStatus
+from src.todo_list import TodoList, TASK_FIELDS, UNSET
+from src.storage import DurabilityMode, get_group_writer
+from src.shard_pool import ShardPool, WRITE_METHODS
+from src.admission import AdmissionController, AdmissionRejected
+from src.compression import CompressionMiddleware
+from src.profiling import ProfilingMiddleware
 
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key-here")  # Change in production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Storage configuration
+DATA_DIR = os.getenv("TODO_DATA_DIR", "data")
+DURABILITY = DurabilityMode(os.getenv("TODO_DURABILITY", DurabilityMode.GROUP.value))
+
+# Number of tenant-sharded worker processes; 0 serves every tenant in-process
+WORKERS = int(os.getenv("TODO_WORKERS", "0"))
+
+# Admission control for mutations; 0 disables a limit
+admission = AdmissionController(
+    rate=float(os.getenv("TODO_RATE_LIMIT", "50")),
+    burst=float(os.getenv("TODO_RATE_BURST", "100")),
+    max_inflight_per_tenant=int(os.getenv("TODO_MAX_INFLIGHT_PER_TENANT", "8")),
+    max_queue_depth=int(os.getenv("TODO_MAX_QUEUE_DEPTH", "256")),
+    max_latency=float(os.getenv("TODO_MAX_LATENCY_MS", "500")) / 1000,
+)
+
+# Request profiling and operator endpoints are only enabled when an admin token is configured
+ADMIN_TOKEN = os.getenv("TODO_ADMIN_TOKEN")
+PROFILE_DIR = os.getenv("TODO_PROFILE_DIR", "profiles")
+PROFILE_FORMAT = os.getenv("TODO_PROFILE_FORMAT", "pstats")
+
 app = FastAPI(title="Todo API", version="1.0.0")
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("TODO_COMPRESS_MIN_BYTES", "1024")),
+)
+# Added last so it is outermost and the profile also covers compression
+app.add_middleware(
+    ProfilingMiddleware,
+    admin_token=ADMIN_TOKEN,
+    directory=PROFILE_DIR,
+    default_format=PROFILE_FORMAT,
+)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Models
@@ -27,21 +66,80 @@ class Token(BaseModel):
 class TaskCreate(BaseModel):
     title: str
     description: Optional[str] = None
+    priority: Optional[int] = None
+    due_at: Optional[datetime] = None
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
+    priority: Optional[int] = None
+    due_at: Optional[datetime] = None
+
+def isoformat(value: Optional[datetime]) -> Optional[str]:
+    """Convert an optional datetime to the ISO string stored on tasks."""
+    return value.isoformat() if value is not None else None
 
 # Store todos by tenant (in memory for now, use proper DB in production)
 tenant_todos = {}
+shard_pool: Optional[ShardPool] = None
 
 def get_todo_list(tenant_id: str) -> TodoList:
     """Get or create a TodoList for a tenant."""
     if tenant_id not in tenant_todos:
-        tenant_todos[tenant_id] = TodoList(filename=f"data/{tenant_id}_tasks.json")
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tenant_todos[tenant_id] = TodoList(
+            os.path.join(DATA_DIR, f"{tenant_id}_tasks.json"),
+            durability=DURABILITY,
+        )
     return tenant_todos[tenant_id]
 
+def get_shard_pool() -> Optional[ShardPool]:
+    """Get the worker pool, starting it on first use when TODO_WORKERS is set."""
+    global shard_pool
+    if WORKERS and shard_pool is None:
+        shard_pool = ShardPool(WORKERS, DATA_DIR, DURABILITY)
+    return shard_pool
+
+async def wait_for_commit(todo_list: TodoList) -> None:
+    """Hold a mutation's response until its changes are durable."""
+    await asyncio.wrap_future(todo_list.commit_future())
+
+async def run_tenant_op(tenant_id: str, method: str, *args):
+    """Run a TodoList method for a tenant, in-process or on its shard.
+
+    Shards return the result already JSON-encoded, which is passed through
+    as the response body. Falsy results are decoded so handlers can still
+    detect missing tasks.
+    """
+    pool = get_shard_pool()
+    if pool is not None:
+        body = await asyncio.wrap_future(pool.submit(tenant_id, method, *args))
+        if body in (b"null", b"false"):
+            return None
+        return Response(content=body, media_type="application/json")
+
+    todo_list = get_todo_list(tenant_id)
+    result = getattr(todo_list, method)(*args)
+    if method in WRITE_METHODS and result:
+        await wait_for_commit(todo_list)
+    return result
+
+@app.on_event("startup")
+def start_shard_pool():
+    """Start worker processes up front so the first requests don't pay for it."""
+    get_shard_pool()
+
+@app.on_event("shutdown")
+def flush_pending_writes():
+    """Commit any outstanding writes before the process exits."""
+    global shard_pool
+    if shard_pool is not None:
+        shard_pool.close()
+        shard_pool = None
+    if DURABILITY is DurabilityMode.GROUP:
+        get_group_writer().flush()
+
 async def get_current_tenant(token: str = Depends(oauth2_scheme)) -> str:
     """Validate JWT token and return tenant ID."""
     credentials_exception = HTTPException(
@@ -58,6 +156,27 @@ async def get_current_tenant(token: str = Depends(oauth2_scheme)) -> str:
     except JWTError:
         raise credentials_exception
 
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Require the operator token (TODO_ADMIN_TOKEN) in the X-Admin-Token header."""
+    if (x_admin_token is None or not ADMIN_TOKEN
+            or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode())):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+async def admit_mutation(tenant_id: str = Depends(get_current_tenant)):
+    """Apply per-tenant rate limits and global load shedding to a mutation."""
+    try:
+        started = admission.admit(tenant_id)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Request shed: {exc.reason}",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    try:
+        yield tenant_id
+    finally:
+        admission.release(tenant_id, started)
+
 @app.post("/token")
 async def create_token(tenant_id: str):
     """Create a new access token for a tenant."""
@@ -70,53 +189,94 @@ async def create_token(tenant_id: str):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/tasks")
-async def create_task(task: TaskCreate, tenant_id: str = Depends(get_current_tenant)):
+async def create_task(task: TaskCreate, tenant_id: str = Depends(admit_mutation)):
     """Create a new task."""
-    todo_list = get_todo_list(tenant_id)
-    new_task = todo_list.add_task(task.title, task.description)
-    return new_task
+    return await run_tenant_op(
+        tenant_id,
+        'add_task',
+        task.title,
+        task.description,
+        task.priority,
+        isoformat(task.due_at)
+    )
 
 @app.get("/tasks")
 async def list_tasks(
     status: Optional[str] = None,
     sort: bool = False,
+    fields: Optional[str] = None,
     tenant_id: str = Depends(get_current_tenant)
 ):
-    """List all tasks, optionally filtered by status."""
-    todo_list = get_todo_list(tenant_id)
-    return todo_list.list_tasks(status=status, sort=sort)
+    """List all tasks, optionally filtered by status and projected to fields."""
+    field_list = None
+    if fields is not None:
+        field_list = [field.strip() for field in fields.split(",") if field.strip()]
+        if not field_list:
+            raise HTTPException(status_code=400, detail="fields must name at least one field")
+        unknown = [field for field in field_list if field not in TASK_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return await run_tenant_op(tenant_id, 'list_tasks', status, sort, field_list)
+
+@app.get("/tasks/next")
+async def next_tasks(
+    k: int = Query(10, ge=1, le=1000),
+    tenant_id: str = Depends(get_current_tenant)
+):
+    """Return the top k actionable tasks by priority, due date and age."""
+    return await run_tenant_op(tenant_id, 'next_tasks', k)
 
 @app.put("/tasks/{task_id}")
 async def update_task(
     task_id: int,
     task: TaskUpdate,
-    tenant_id: str = Depends(get_current_tenant)
+    tenant_id: str = Depends(admit_mutation)
 ):
-    """Update a task."""
-    todo_list = get_todo_list(tenant_id)
-    updated_task = todo_list.update_task(
+    """Update a task; an explicit null priority or due_at clears it."""
+    provided = getattr(task, 'model_fields_set', None)
+    if provided is None:
+        provided = task.__fields_set__
+    updated_task = await run_tenant_op(
+        tenant_id,
+        'update_task',
         task_id,
         task.title,
         task.description,
-        task.status
+        task.status,
+        task.priority if 'priority' in provided else UNSET,
+        isoformat(task.due_at) if 'due_at' in provided else UNSET
     )
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
     return updated_task
 
 @app.delete("/tasks/{task_id}")
-async def delete_task(task_id: int, tenant_id: str = Depends(get_current_tenant)):
+async def delete_task(task_id: int, tenant_id: str = Depends(admit_mutation)):
     """Delete a task."""
-    todo_list = get_todo_list(tenant_id)
-    if not todo_list.delete_task(task_id):
+    if not await run_tenant_op(tenant_id, 'delete_task', task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     return {"status": "success"}
 
 @app.post("/tasks/{task_id}/complete")
-async def complete_task(task_id: int, tenant_id: str = Depends(get_current_tenant)):
+async def complete_task(task_id: int, tenant_id: str = Depends(admit_mutation)):
     """Mark a task as complete."""
-    todo_list = get_todo_list(tenant_id)
-    completed_task = todo_list.complete_task(task_id)
+    completed_task = await run_tenant_op(tenant_id, 'mark_complete', task_id)
     if not completed_task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return completed_task
\ No newline at end of file
+    return completed_task
+
+@app.get("/metrics/admission")
+async def admission_metrics(_: None = Depends(require_admin)):
+    """Report token bucket levels, in-flight mutations and shed counts."""
+    return admission.stats()
+
+@app.put("/admin/workers")
+async def resize_workers(size: int = Query(..., ge=1), _: None = Depends(require_admin)):
+    """Resize the shard pool, rebalancing tenants across the new workers."""
+    pool = get_shard_pool()
+    if pool is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="Sharding is disabled; set TODO_WORKERS to enable it")
+    # resize() waits for in-flight requests to drain; requests arriving meanwhile are queued.
+    moved = await asyncio.get_running_loop().run_in_executor(None, pool.resize, size)
+    return {"workers": pool.size, "moved_tenants": len(moved)}
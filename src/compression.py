@@ -0,0 +1,97 @@
+"""Response compression middleware with optional brotli support."""
+
+import gzip
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses response bodies above a size threshold.
+
+    Brotli is preferred when it is installed and the client accepts it,
+    otherwise gzip is used. Streaming responses and bodies that are
+    already encoded are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(scope['headers'])
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def compressing_send(message):
+            nonlocal start_message
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = start['headers']
+            body = message.get('body', b'')
+            if (message.get('more_body', False) or len(body) < self.minimum_size
+                    or _get_header(headers, b'content-encoding') is not None):
+                await send(start)
+                await send(message)
+                return
+
+            body = self._compress(encoding, body)
+            start = dict(start, headers=_with_encoding_headers(headers, encoding, len(body)))
+            await send(start)
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, compressing_send)
+
+    def _choose_encoding(self, headers: List[Tuple[bytes, bytes]]) -> Optional[str]:
+        accept = _get_header(headers, b'accept-encoding')
+        if not accept:
+            return None
+        accepted = set()
+        for item in accept.decode('latin-1').split(','):
+            coding, _, params = item.strip().partition(';')
+            if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                continue
+            accepted.add(coding.strip().lower())
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+def _get_header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+def _with_encoding_headers(headers: List[Tuple[bytes, bytes]], encoding: str,
+                           length: int) -> List[Tuple[bytes, bytes]]:
+    vary = _get_header(headers, b'vary')
+    result = [(key, value) for key, value in headers
+              if key.lower() not in (b'content-length', b'vary')]
+    result.append((b'content-encoding', encoding.encode('latin-1')))
+    result.append((b'content-length', str(length).encode('latin-1')))
+    result.append((b'vary', vary + b', Accept-Encoding' if vary else b'Accept-Encoding'))
+    return result
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Reproducible multi-tenant load generator for the Todo API.
+
+Synthetic tenants are preloaded with tasks according to their size
+bucket, receive tokens from ``/token`` and then drive a seeded mix of
+create, list, update, complete and delete requests. The API either runs
+in-process through its ASGI app or in a locally started uvicorn, and the
+resulting JSON report gives throughput and p50/p95/p99 latency per route
+and per tenant-size bucket. Run from the repository root:
+
+    python -m src.loadtest --tenants 20 --requests 2000 --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from .todo_list import TodoList, TaskStatus
+
+DEFAULT_MIX = "create=30,list=40,update=15,complete=10,delete=5"
+DEFAULT_SIZES = "small=10,medium=100,large=1000"
+OPERATIONS = ('create', 'list', 'update', 'complete', 'delete')
+PRELOAD_TIMESTAMP = "2024-01-01T00:00:00"
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse a 'name=value,name=value' specification."""
+    weights = {}
+    for item in spec.split(','):
+        name, _, value = item.partition('=')
+        weights[name.strip()] = float(value)
+    return weights
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))
+    return sorted_values[rank - 1]
+
+def summarize(samples: List[Tuple[float, int]], elapsed: float) -> Dict:
+    """Summarize (latency, status code) samples."""
+    latencies = sorted(latency for latency, _ in samples)
+    statuses: Dict[str, int] = defaultdict(int)
+    for _, code in samples:
+        statuses[str(code)] += 1
+    return {
+        'count': len(samples),
+        'errors': sum(1 for _, code in samples if code >= 500),
+        'status': dict(sorted(statuses.items())),
+        'throughput_rps': len(samples) / elapsed if elapsed else 0.0,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+class Tenant:
+    """Synthetic tenant with its own seeded choices and known task IDs."""
+
+    def __init__(self, tenant_id: str, bucket: str, size: int, seed: int):
+        self.tenant_id = tenant_id
+        self.bucket = bucket
+        self.task_ids = list(range(1, size + 1))
+        self.rng = random.Random(f"{seed}:{tenant_id}")
+        self.headers: Dict[str, str] = {}
+
+    def preload(self, data_dir: str) -> None:
+        """Write the tenant's initial tasks straight to its task file."""
+        todo_list = TodoList(os.path.join(data_dir, f"{self.tenant_id}_tasks.json"))
+        todo_list.tasks = [
+            {'id': task_id, 'title': f"Preloaded task {task_id}",
+             'description': f"Synthetic task {task_id} for {self.tenant_id}",
+             'status': TaskStatus.PENDING.value, 'created_at': PRELOAD_TIMESTAMP,
+             'modified_at': PRELOAD_TIMESTAMP, 'completed_at': None}
+            for task_id in self.task_ids
+        ]
+        todo_list._save_tasks()
+
+    def build_request(self, operation: str) -> Tuple[str, str, str, Dict]:
+        """Return (route, method, url, kwargs) for the next request."""
+        if operation in ('update', 'complete', 'delete') and not self.task_ids:
+            operation = 'create'
+        if operation == 'create':
+            return ('POST /tasks', 'POST', '/tasks',
+                    {'json': {'title': f"Load task {self.rng.randrange(10**6)}",
+                              'description': "Created by the load generator"}})
+        if operation == 'list':
+            return 'GET /tasks', 'GET', '/tasks', {}
+        task_id = self.rng.choice(self.task_ids)
+        if operation == 'update':
+            return ('PUT /tasks/{task_id}', 'PUT', f"/tasks/{task_id}",
+                    {'json': {'title': f"Updated {self.rng.randrange(10**6)}"}})
+        if operation == 'complete':
+            return ('POST /tasks/{task_id}/complete', 'POST', f"/tasks/{task_id}/complete", {})
+        self.task_ids.remove(task_id)
+        return 'DELETE /tasks/{task_id}', 'DELETE', f"/tasks/{task_id}", {}
+
+    def record_response(self, operation: str, response: httpx.Response) -> None:
+        """Track IDs of tasks created by this tenant."""
+        if operation == 'create' and response.status_code == 200:
+            self.task_ids.append(response.json()['id'])
+
+def make_tenants(count: int, sizes: Dict[str, float], seed: int) -> List[Tenant]:
+    """Create tenants spread evenly over the size buckets."""
+    buckets = sorted(sizes.items(), key=lambda item: item[1])
+    return [
+        Tenant(f"loadtest-{i:04d}", buckets[i % len(buckets)][0],
+               int(buckets[i % len(buckets)][1]), seed)
+        for i in range(count)
+    ]
+
+def make_schedule(tenants: List[Tenant], requests: int, mix: Dict[str, float],
+                  seed: int) -> List[Tuple[Tenant, str]]:
+    """Build the seeded sequence of (tenant, operation) requests."""
+    rng = random.Random(seed)
+    operations = [op for op in OPERATIONS if mix.get(op)]
+    weights = [mix[op] for op in operations]
+    return [(rng.choice(tenants), rng.choices(operations, weights)[0]) for _ in range(requests)]
+
+async def run_load(client: httpx.AsyncClient, tenants: List[Tenant],
+                   schedule: List[Tuple[Tenant, str]], concurrency: int):
+    """Drive the schedule and return samples and elapsed time.
+
+    Each tenant's requests always go to the same worker, in schedule
+    order, so every tenant sees the same sequence from run to run.
+    """
+    for tenant in tenants:
+        response = await client.post('/token', params={'tenant_id': tenant.tenant_id})
+        response.raise_for_status()
+        tenant.headers = {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+    index = {tenant.tenant_id: i for i, tenant in enumerate(tenants)}
+    queues: List[List[Tuple[Tenant, str]]] = [[] for _ in range(concurrency)]
+    for tenant, operation in schedule:
+        queues[index[tenant.tenant_id] % concurrency].append((tenant, operation))
+
+    samples = []
+
+    async def worker(queue):
+        for tenant, operation in queue:
+            route, method, url, kwargs = tenant.build_request(operation)
+            start = time.perf_counter()
+            response = await client.request(method, url, headers=tenant.headers, **kwargs)
+            latency = time.perf_counter() - start
+            tenant.record_response(operation, response)
+            samples.append((route, tenant.bucket, latency, response.status_code))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(queue) for queue in queues if queue))
+    return samples, time.perf_counter() - start
+
+def build_report(config: Dict, samples, elapsed: float) -> Dict:
+    """Aggregate samples into the machine-readable report."""
+    by_route = defaultdict(list)
+    by_bucket = defaultdict(list)
+    by_bucket_route = defaultdict(lambda: defaultdict(list))
+    for route, bucket, latency, code in samples:
+        by_route[route].append((latency, code))
+        by_bucket[bucket].append((latency, code))
+        by_bucket_route[bucket][route].append((latency, code))
+
+    return {
+        'config': config,
+        'elapsed_s': elapsed,
+        'overall': summarize([(latency, code) for _, _, latency, code in samples], elapsed),
+        'routes': {route: summarize(by_route[route], elapsed) for route in sorted(by_route)},
+        'buckets': {
+            bucket: dict(summarize(by_bucket[bucket], elapsed), routes={
+                route: summarize(by_bucket_route[bucket][route], elapsed)
+                for route in sorted(by_bucket_route[bucket])
+            })
+            for bucket in sorted(by_bucket)
+        },
+    }
+
+async def run_in_process(tenants, schedule, concurrency):
+    """Run the load against the ASGI app inside this process."""
+    from . import api
+
+    api.start_shard_pool()
+    try:
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_load(client, tenants, schedule, concurrency)
+    finally:
+        api.flush_pending_writes()
+
+async def run_against_uvicorn(tenants, schedule, concurrency, data_dir):
+    """Start uvicorn on a free local port and run the load against it."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'src.api:app', '--host', '127.0.0.1',
+         '--port', str(port), '--log-level', 'warning'],
+        cwd=root, env=dict(os.environ, TODO_DATA_DIR=data_dir),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get('/openapi.json')).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.1)
+            return await run_load(client, tenants, schedule, concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    """Main entry point for the load generator."""
+    parser = argparse.ArgumentParser(description='Multi-tenant load generator for the Todo API')
+    parser.add_argument('--mode', choices=['in-process', 'uvicorn'], default='in-process',
+                        help='Run the API in-process or in a local uvicorn server')
+    parser.add_argument('--tenants', type=int, default=20, help='Number of synthetic tenants')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests to send')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='Concurrent clients (each owns a fixed set of tenants)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Operation weights')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help='Tenant size buckets as name=preloaded task count')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('-o', '--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    mix = parse_weights(args.mix)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations in --mix: {', '.join(sorted(unknown))}")
+    sizes = parse_weights(args.sizes)
+    config = {key: value for key, value in vars(args).items() if key != 'output'}
+    config['python'] = platform.python_version()
+    config['api_env'] = {k: v for k, v in sorted(os.environ.items())
+                         if k.startswith('TODO_') and k != 'TODO_ADMIN_TOKEN'}
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        tenants = make_tenants(args.tenants, sizes, args.seed)
+        for tenant in tenants:
+            tenant.preload(data_dir)
+        schedule = make_schedule(tenants, args.requests, mix, args.seed)
+
+        if args.mode == 'uvicorn':
+            samples, elapsed = asyncio.run(
+                run_against_uvicorn(tenants, schedule, args.concurrency, data_dir))
+        else:
+            os.environ['TODO_DATA_DIR'] = data_dir
+            samples, elapsed = asyncio.run(run_in_process(tenants, schedule, args.concurrency))
+
+    report = json.dumps(build_report(config, samples, elapsed), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ from .list_tasks import ListTasksOperation
 from .update_task import UpdateTaskOperation
 from .delete_task import DeleteTaskOperation
 from .complete_task import CompleteTaskOperation
+from .next_tasks import NextTasksOperation
 
 __all__ = [
     'AddTaskOperation',
@@ -14,4 +15,5 @@ __all__ = [
     'UpdateTaskOperation',
     'DeleteTaskOperation',
     'CompleteTaskOperation',
+    'NextTasksOperation',
 ]
\ No newline at end of file
@@ -1,23 +1,28 @@
 """Add task operation."""
 
 from typing import Optional, Dict
-from .base import BaseOperation
+from .base import BaseOperation, due_date
 from ..todo_list import TodoList
 
 class AddTaskOperation(BaseOperation):
     """Operation to add a new task."""
 
-    def execute(self, title: str, description: Optional[str] = None) -> Dict:
+    def execute(self, title: str, description: Optional[str] = None,
+               priority: Optional[int] = None, due_at: Optional[str] = None) -> Dict:
         """Execute the add task operation."""
-        return self.todo_list.add_task(title, description)
+        return self.todo_list.add_task(title, description, priority, due_at)
 
     def add_parser(self, subparsers) -> None:
         """Add the parser for this operation."""
         parser = subparsers.add_parser('add', help='Add a new task')
         parser.add_argument('title', help='Task title')
         parser.add_argument('-d', '--description', help='Task description')
+        parser.add_argument('-p', '--priority', type=int,
+                          help='Task priority (lower numbers come first)')
+        parser.add_argument('--due', type=due_date,
+                          help='Due date in ISO 8601 format (UTC unless an offset is given)')
 
     def handle_args(self, args) -> None:
         """Handle the parsed arguments."""
-        task = self.execute(args.title, args.description)
+        task = self.execute(args.title, args.description, args.priority, args.due)
         print(f"Added task {task['id']}: {task['title']}")
\ No newline at end of file
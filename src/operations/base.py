@@ -1,9 +1,19 @@
 """Base operation class for todo list operations."""
 
+import argparse
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, Dict, Any
 from ..todo_list import TodoList
 
+def due_date(value: str) -> str:
+    """argparse type for due dates; rejects anything that isn't ISO 8601."""
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO 8601 date: {value!r}")
+    return value
+
 class BaseOperation(ABC):
     """Base class for all todo operations."""
     
@@ -36,6 +36,10 @@ class ListTasksOperation(BaseOperation):
             print(f"{task['id']:3d}. {status:12} {task['title']} (Created: {created})")
             if task['description']:
                 print(f"     Description: {task['description']}")
+            if task.get('priority') is not None:
+                print(f"     Priority: {task['priority']}")
+            if task.get('due_at'):
+                print(f"     Due: {task['due_at']}")
             if task['modified_at'] != task['created_at']:
                 modified = datetime.fromisoformat(task['modified_at']).strftime('%Y-%m-%d %H:%M')
                 print(f"     Last modified: {modified}")
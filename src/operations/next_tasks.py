@@ -0,0 +1,38 @@
+"""Next tasks operation."""
+
+from typing import List, Dict
+from .base import BaseOperation
+from ..todo_list import TodoList
+
+class NextTasksOperation(BaseOperation):
+    """Operation to show the next actionable tasks."""
+
+    def execute(self, k: int = 10) -> List[Dict]:
+        """Execute the next tasks operation."""
+        return self.todo_list.next_tasks(k)
+
+    def add_parser(self, subparsers) -> None:
+        """Add the parser for this operation."""
+        parser = subparsers.add_parser('next', help='Show the next tasks to work on')
+        parser.add_argument('-k', type=int, default=10,
+                          help='Number of tasks to show (default: 10)')
+
+    def handle_args(self, args) -> None:
+        """Handle the parsed arguments."""
+        tasks = self.execute(args.k)
+        if not tasks:
+            print("No actionable tasks.")
+            return
+
+        print("\nNext up:")
+        print("-" * 60)
+        for task in tasks:
+            status = f"[{task['status']}]"
+            details = []
+            if task.get('priority') is not None:
+                details.append(f"Priority: {task['priority']}")
+            if task.get('due_at'):
+                details.append(f"Due: {task['due_at']}")
+            suffix = f" ({', '.join(details)})" if details else ""
+            print(f"{task['id']:3d}. {status:12} {task['title']}{suffix}")
+        print("-" * 60)
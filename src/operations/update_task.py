@@ -1,17 +1,19 @@
 """Update task operation."""
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 from datetime import datetime
-from .base import BaseOperation
-from ..todo_list import TodoList, TaskStatus
+from .base import BaseOperation, due_date
+from ..todo_list import TodoList, TaskStatus, UNSET, Unset
 
 class UpdateTaskOperation(BaseOperation):
     """Operation to update a task."""
 
     def execute(self, task_id: int, title: Optional[str] = None,
-               description: Optional[str] = None, status: Optional[str] = None) -> Optional[Dict]:
+               description: Optional[str] = None, status: Optional[str] = None,
+               priority: Union[int, None, Unset] = UNSET,
+               due_at: Union[str, None, Unset] = UNSET) -> Optional[Dict]:
         """Execute the update task operation."""
-        return self.todo_list.update_task(task_id, title, description, status)
+        return self.todo_list.update_task(task_id, title, description, status, priority, due_at)
 
     def add_parser(self, subparsers) -> None:
         """Add the parser for this operation."""
@@ -22,20 +24,38 @@ class UpdateTaskOperation(BaseOperation):
         parser.add_argument('-s', '--status',
                           choices=[s.value for s in TaskStatus],
                           help='New task status')
+        priority = parser.add_mutually_exclusive_group()
+        priority.add_argument('-p', '--priority', type=int,
+                            help='New task priority (lower numbers come first)')
+        priority.add_argument('--clear-priority', action='store_true',
+                            help='Remove the task priority')
+        due = parser.add_mutually_exclusive_group()
+        due.add_argument('--due', type=due_date,
+                       help='New due date in ISO 8601 format (UTC unless an offset is given)')
+        due.add_argument('--clear-due', action='store_true', help='Remove the due date')
 
     def handle_args(self, args) -> None:
         """Handle the parsed arguments."""
-        if not any([args.title, args.description, args.status]):
-            print("Please specify at least one field to update (title, description, or status)")
+        if not any([args.title, args.description, args.status, args.priority is not None,
+                    args.clear_priority, args.due, args.clear_due]):
+            print("Please specify at least one field to update "
+                  "(title, description, status, priority, or due date)")
             return
 
-        task = self.execute(args.task_id, args.title, args.description, args.status)
+        priority = None if args.clear_priority else UNSET if args.priority is None else args.priority
+        due_at = None if args.clear_due else UNSET if args.due is None else args.due
+        task = self.execute(args.task_id, args.title, args.description, args.status,
+                            priority, due_at)
         if task:
             print(f"Updated task {task['id']}:")
             print(f"  Title: {task['title']}")
             print(f"  Status: {task['status']}")
             if task['description']:
                 print(f"  Description: {task['description']}")
+            if task.get('priority') is not None:
+                print(f"  Priority: {task['priority']}")
+            if task.get('due_at'):
+                print(f"  Due: {task['due_at']}")
             modified = datetime.fromisoformat(task['modified_at']).strftime('%Y-%m-%d %H:%M')
             print(f"  Last modified: {modified}")
         else:
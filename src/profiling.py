@@ -0,0 +1,189 @@
+"""On-demand profiling for CLI commands and API requests.
+
+Two output formats are supported:
+
+- ``pstats``: a cProfile dump of the calling thread, readable with
+  ``python -m pstats`` or snakeviz
+- ``collapsed``: sampled stacks of every thread in the collapsed format
+  used by flamegraph.pl and speedscope, which also covers background
+  threads such as the group commit writer
+"""
+
+import contextlib
+import cProfile
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+PROFILE_FORMATS = ('pstats', 'collapsed')
+
+_EXTENSIONS = {'pstats': 'prof', 'collapsed': 'folded'}
+
+# cProfile hooks are per interpreter, so only one capture can run at a time.
+_profile_lock = threading.Lock()
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+class StackSampler:
+    """Sampling profiler that counts collapsed stacks across all threads.
+
+    Samples are taken when sampling starts and stops as well as every
+    ``interval``, so even very short runs record where each thread was.
+    The sampler's own frames, and the ``profile`` context manager frames
+    of the thread that started it, are left out.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Take a first sample, then keep sampling in a background thread."""
+        self._sample()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampler thread, then take a final sample."""
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def write(self, path: str) -> None:
+        """Write samples as 'frame;frame;frame count' lines."""
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self._thread.ident:
+                continue
+            stack = []
+            skip_exit = False
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename == __file__:
+                    # Starting or stopping the sampler: drop everything from here down.
+                    stack = []
+                    skip_exit = True
+                elif not (skip_exit and code.co_filename == contextlib.__file__):
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                                 f"{code.co_firstlineno})".replace(';', ':'))
+                    skip_exit = False
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)).replace(';', ':'))
+            self.counts[';'.join(reversed(stack))] += 1
+
+@contextmanager
+def profile(directory: str, label: str, fmt: str = 'pstats') -> Iterator[Dict[str, str]]:
+    """Profile the enclosed block and write the result to directory.
+
+    Yields a dict whose 'path' entry names the output file, which is
+    written once the block exits. Raises ProfilerBusy if another profile
+    is running.
+    """
+    if fmt not in PROFILE_FORMATS:
+        raise ValueError(f"Unknown profile format: {fmt}")
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("Another profile is already being captured")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'profile'
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        path = os.path.join(directory, f"{name}-{stamp}-{os.getpid()}.{_EXTENSIONS[fmt]}")
+        result = {'path': path}
+        if fmt == 'collapsed':
+            sampler = StackSampler()
+            sampler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            yield result
+        finally:
+            if fmt == 'collapsed':
+                sampler.stop()
+                sampler.write(path)
+            else:
+                profiler.disable()
+                profiler.dump_stats(path)
+    finally:
+        _profile_lock.release()
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests carrying the admin token in X-Profile.
+
+    Requests without the header, and every request when no token is
+    configured, go straight to the app untouched. A profiled response names
+    its output file in X-Profile-Output. The profile covers the whole
+    process while the request runs, including any requests served
+    alongside it, and X-Profile-Scope says so.
+    """
+
+    def __init__(self, app, admin_token: Optional[str], directory: str = 'profiles',
+                 default_format: str = 'pstats'):
+        self.app = app
+        self.admin_token = admin_token.encode() if admin_token else None
+        self.directory = directory
+        self.default_format = default_format
+
+    async def __call__(self, scope, receive, send):
+        token = _get_header(scope, b'x-profile') if scope['type'] == 'http' else None
+        if token is None or self.admin_token is None:
+            await self.app(scope, receive, send)
+            return
+        if not hmac.compare_digest(token, self.admin_token):
+            await _send_error(send, 403, "Invalid profiling token")
+            return
+        fmt_header = _get_header(scope, b'x-profile-format')
+        fmt = fmt_header.decode('latin-1') if fmt_header else self.default_format
+        if fmt not in PROFILE_FORMATS:
+            await _send_error(send, 400, f"Unknown profile format: {fmt}")
+            return
+
+        with contextlib.ExitStack() as stack:
+            try:
+                result = stack.enter_context(
+                    profile(self.directory, f"{scope['method']} {scope['path']}", fmt))
+            except ProfilerBusy:
+                await _send_error(send, 409, "Another request is being profiled")
+                return
+            extra_headers = [
+                (b'x-profile-output', os.path.basename(result['path']).encode('latin-1')),
+                (b'x-profile-scope', b'process; includes concurrent requests'),
+            ]
+
+            async def profiled_send(message):
+                if message['type'] == 'http.response.start':
+                    message = dict(message, headers=list(message.get('headers', [])) + extra_headers)
+                await send(message)
+
+            await self.app(scope, receive, profiled_send)
+
+def _get_header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope['headers']:
+        if key.lower() == name:
+            return value
+    return None
+
+async def _send_error(send, status_code: int, detail: str) -> None:
+    body = json.dumps({'detail': detail}).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status_code,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(body)).encode('latin-1'))]})
+    await send({'type': 'http.response.body', 'body': body})
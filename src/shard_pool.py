@@ -0,0 +1,324 @@
+"""Tenant-sharded pool of worker processes for the API.
+
+Tenants are mapped to named shards with a consistent hash ring. Each shard
+is a separate process that owns the ``TodoList`` instances of its tenants,
+so CPU-bound work such as JSON encoding runs outside the API process and
+across cores. Results come back over a pipe already encoded as JSON.
+"""
+
+import bisect
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .storage import DurabilityMode
+from .todo_list import TodoList
+
+# TodoList methods a shard will run on behalf of the front end
+READ_METHODS = frozenset({'list_tasks', 'next_tasks'})
+WRITE_METHODS = frozenset({'add_task', 'update_task', 'delete_task', 'mark_complete'})
+
+class ShardError(RuntimeError):
+    """Raised when a shard fails to run an operation."""
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+class HashRing:
+    """Consistent hash ring mapping keys to node names."""
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 64):
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self._keys = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def get_node(self, key: str) -> str:
+        """Return the node that owns key."""
+        if not self._keys:
+            raise ValueError("HashRing has no nodes")
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+def _shard_names(size: int) -> List[str]:
+    return [f"shard-{i}" for i in range(size)]
+
+def _worker_main(conn, name: str, data_dir: str, durability: str) -> None:
+    """Serve TodoList operations for the tenants owned by one shard."""
+    todo_lists: Dict[str, TodoList] = {}
+    send_lock = threading.Lock()
+
+    def reply(request_id: int, ok: bool, payload) -> None:
+        with send_lock:
+            conn.send((request_id, ok, payload))
+
+    def reply_when_committed(request_id: int, future: Future, body: bytes) -> None:
+        error = future.exception()
+        reply(request_id, error is None, body if error is None else repr(error))
+
+    def get_todo_list(tenant_id: str) -> TodoList:
+        if tenant_id not in todo_lists:
+            os.makedirs(data_dir, exist_ok=True)
+            todo_lists[tenant_id] = TodoList(
+                os.path.join(data_dir, f"{tenant_id}_tasks.json"),
+                durability=durability,
+            )
+        return todo_lists[tenant_id]
+
+    def evict(tenant_ids: List[str]) -> None:
+        for tenant_id in tenant_ids:
+            todo_lists.pop(tenant_id).commit_future().result()
+
+    while True:
+        try:
+            request_id, tenant_id, method, args = conn.recv()
+        except EOFError:
+            break
+
+        if method == '_rebalance':
+            ring = HashRing(args[0])
+            moved = [t for t in todo_lists if ring.get_node(t) != name]
+            evict(moved)
+            reply(request_id, True, moved)
+            continue
+        if method == '_shutdown':
+            tenants = list(todo_lists)
+            evict(tenants)
+            reply(request_id, True, tenants)
+            break
+
+        try:
+            todo_list = get_todo_list(tenant_id)
+            result = getattr(todo_list, method)(*args)
+            body = json.dumps(result).encode('utf-8')
+        except Exception as exc:
+            reply(request_id, False, repr(exc))
+            continue
+        if method in WRITE_METHODS and result:
+            todo_list.commit_future().add_done_callback(
+                lambda future, rid=request_id, body=body: reply_when_committed(rid, future, body))
+        else:
+            reply(request_id, True, body)
+    conn.close()
+
+class _Shard:
+    """Front-end handle for one worker process."""
+
+    def __init__(self, ctx, name: str, data_dir: str, durability: DurabilityMode):
+        self.name = name
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, name=name, daemon=True,
+                                   args=(child_conn, name, data_dir, durability.value))
+        self.process.start()
+        child_conn.close()
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._reader = threading.Thread(target=self._read, name=f"{name}-reader", daemon=True)
+        self._reader.start()
+
+    def call(self, request_id: int, tenant_id: Optional[str], method: str, args: Tuple) -> Future:
+        """Send a request to the worker and return a future for its reply."""
+        future: Future = Future()
+        with self._send_lock:
+            self._pending[request_id] = future
+            try:
+                self.conn.send((request_id, tenant_id, method, args))
+            except Exception as exc:
+                self._pending.pop(request_id, None)
+                error = exc
+            else:
+                return future
+        future.set_exception(ShardError(f"{self.name}: could not send request: {error!r}"))
+        return future
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is still running."""
+        return self.process.is_alive()
+
+    def close(self, request_id: int) -> List[str]:
+        """Flush the worker's tenants, stop the process and return the tenants it held."""
+        try:
+            tenants = self.call(request_id, None, '_shutdown', ()).result()
+        except ShardError:
+            # The worker already died; anything it committed is on disk.
+            tenants = []
+        self.process.join()
+        self._reader.join()
+        return tenants
+
+    def _read(self) -> None:
+        while True:
+            try:
+                request_id, ok, payload = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.pop(request_id)
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(ShardError(f"{self.name}: {payload}"))
+        with self._send_lock:
+            pending, self._pending = self._pending, {}
+            self.conn.close()
+        for future in pending.values():
+            future.set_exception(ShardError(f"{self.name} exited"))
+
+def _chain(source: Future, target: Future) -> None:
+    """Copy the outcome of source into target once it is done."""
+    def copy(done: Future) -> None:
+        exc = done.exception()
+        if exc is not None:
+            target.set_exception(exc)
+        else:
+            target.set_result(done.result())
+    source.add_done_callback(copy)
+
+class ShardPool:
+    """Pool of worker processes that each own a consistent-hash slice of tenants."""
+
+    def __init__(self, size: int, data_dir: str,
+                 durability: Union[str, DurabilityMode] = DurabilityMode.NONE):
+        self.data_dir = data_dir
+        self.durability = DurabilityMode(durability)
+        self._ctx = multiprocessing.get_context('spawn')
+        self._shards: Dict[str, _Shard] = {}
+        self._ring = HashRing([])
+        self._request_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._inflight = 0
+        self._paused = False
+        self._queued: List[Tuple[str, str, Tuple, Future]] = []
+        self.resize(size)
+
+    @property
+    def size(self) -> int:
+        """Number of worker processes in the pool."""
+        return len(self._shards)
+
+    def shard_for(self, tenant_id: str) -> str:
+        """Return the name of the shard that owns a tenant."""
+        return self._ring.get_node(tenant_id)
+
+    def submit(self, tenant_id: str, method: str, *args) -> Future:
+        """Run a TodoList method on the tenant's shard; resolves to JSON bytes.
+
+        Never blocks: while the pool is resizing, the request is queued and
+        sent once the new layout is in place.
+        """
+        if method not in READ_METHODS and method not in WRITE_METHODS:
+            raise ValueError(f"Unsupported operation: {method}")
+        with self._lock:
+            if self._paused:
+                future: Future = Future()
+                self._queued.append((tenant_id, method, args, future))
+                return future
+            shard = self._live_shard(self._ring.get_node(tenant_id))
+            self._inflight += 1
+        return self._send(shard, tenant_id, method, args)
+
+    def resize(self, size: int) -> List[str]:
+        """Change the number of workers and return the tenants that moved.
+
+        New requests are queued while in-flight ones drain. Surviving
+        workers then flush and drop the tenants they no longer own, and
+        removed workers flush and drop all of theirs; the new owners load
+        those tenants from disk on first use. Blocks until the pool is
+        running again, so call it from a thread rather than an event loop.
+        """
+        if size < 1:
+            raise ValueError("ShardPool needs at least one worker")
+        names = _shard_names(size)
+        self._pause()
+        try:
+            with self._lock:
+                for name in list(self._shards):
+                    self._live_shard(name)
+            rebalances = [
+                shard.call(next(self._request_ids), None, '_rebalance', (names,))
+                for name, shard in self._shards.items() if name in names
+            ]
+            moved = []
+            for future in rebalances:
+                try:
+                    moved.extend(future.result())
+                except ShardError:
+                    # The worker died; it is replaced on next use and its tenants reload from disk.
+                    pass
+            for name in [name for name in self._shards if name not in names]:
+                moved.extend(self._shards.pop(name).close(next(self._request_ids)))
+            for name in names:
+                if name not in self._shards:
+                    self._shards[name] = _Shard(self._ctx, name, self.data_dir, self.durability)
+            self._ring = HashRing(names)
+        finally:
+            self._resume()
+        return moved
+
+    def close(self) -> None:
+        """Flush every tenant and stop all workers."""
+        self._pause()
+        try:
+            for shard in self._shards.values():
+                shard.close(next(self._request_ids))
+            self._shards.clear()
+            self._ring = HashRing([])
+        finally:
+            self._resume()
+
+    def _pause(self) -> None:
+        with self._lock:
+            while self._paused:
+                self._idle.wait()
+            self._paused = True
+            while self._inflight:
+                self._idle.wait()
+
+    def _resume(self) -> None:
+        with self._lock:
+            self._paused = False
+            self._idle.notify_all()
+            queued, self._queued = self._queued, []
+            closed = not self._shards
+            if not closed:
+                self._inflight += len(queued)
+                routed = [(self._live_shard(self._ring.get_node(tenant_id)), tenant_id, method, args,
+                           future) for tenant_id, method, args, future in queued]
+        if closed:
+            for _, _, _, future in queued:
+                future.set_exception(ShardError("ShardPool is closed"))
+            return
+        for shard, tenant_id, method, args, future in routed:
+            _chain(self._send(shard, tenant_id, method, args), future)
+
+    def _live_shard(self, name: str) -> _Shard:
+        """Return the named shard, restarting its worker if it has died.
+
+        The new worker reloads its tenants from disk on first use. Requests
+        that were in flight on the old one fail with ShardError. Must hold
+        the lock.
+        """
+        shard = self._shards[name]
+        if not shard.alive:
+            # Only reap the process: the old reader fails its requests, which takes our lock.
+            shard.process.join()
+            shard = self._shards[name] = _Shard(self._ctx, name, self.data_dir, self.durability)
+        return shard
+
+    def _send(self, shard: _Shard, tenant_id: str, method: str, args: Tuple) -> Future:
+        future = shard.call(next(self._request_ids), tenant_id, method, args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._inflight -= 1
+            if not self._inflight:
+                self._idle.notify_all()
@@ -0,0 +1,172 @@
+"""Durable storage helpers for task files."""
+
+import atexit
+import contextlib
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+class DurabilityMode(Enum):
+    """Enumeration of supported durability modes for saving tasks."""
+    NONE = "none"
+    PER_WRITE = "per-write"
+    GROUP = "group"
+
+    def __str__(self):
+        return self.value
+
+def fsync_directory(directory: str) -> None:
+    """Flush a directory entry so a completed rename survives a crash."""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_temp(path: str, data: bytes) -> str:
+    """Write data to an fsynced temp file next to path and return its name."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.",
+                                    suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+        os.chmod(tmp_path, mode)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace path with data using an fsynced temp file and atomic rename."""
+    tmp_path = _write_temp(path, data)
+    os.replace(tmp_path, path)
+    fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+class GroupCommitWriter:
+    """Background writer that commits dirty files together in small groups.
+
+    Each call to ``submit`` replaces any not-yet-written contents for the
+    same path, so a tenant that mutates several times within one interval
+    is written once. All files in a group are written and renamed before
+    their directories are fsynced, and every waiter in the group is
+    released together.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: Dict[str, Tuple[Callable[[], bytes], Future]] = {}
+        self._committing: List[Future] = []
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, path: str, encode: Callable[[], bytes]) -> Future:
+        """Queue new contents for path; the future resolves once committed."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+            entry = self._pending.get(path)
+            future = entry[1] if entry else Future()
+            self._pending[path] = (encode, future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name="group-commit", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+        return future
+
+    def flush(self) -> None:
+        """Block until everything submitted so far has been committed."""
+        with self._lock:
+            futures = self._committing + [future for _, future in self._pending.values()]
+        for future in futures:
+            future.exception()
+
+    def close(self) -> None:
+        """Commit outstanding writes and stop the writer thread."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if not self._pending:
+                    return
+                closing = self._closed
+            if not closing:
+                # Give other tenants a chance to join this group.
+                time.sleep(self.interval)
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._committing = [future for _, future in batch.values()]
+            try:
+                self._commit(batch)
+            except Exception as exc:
+                # Never let one bad group kill the thread and strand every later waiter.
+                for future in self._committing:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._committing = []
+
+    def _commit(self, batch: Dict[str, Tuple[Callable[[], bytes], Future]]) -> None:
+        staged: List[Tuple[str, str, Future]] = []
+        for path, (encode, future) in batch.items():
+            try:
+                staged.append((path, _write_temp(path, encode()), future))
+            except Exception as exc:
+                future.set_exception(exc)
+
+        by_directory: Dict[str, List[Future]] = {}
+        for path, tmp_path, future in staged:
+            try:
+                os.replace(tmp_path, path)
+            except Exception as exc:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                future.set_exception(exc)
+                continue
+            directory = os.path.dirname(os.path.abspath(path))
+            by_directory.setdefault(directory, []).append(future)
+
+        for directory, futures in by_directory.items():
+            try:
+                fsync_directory(directory)
+            except Exception as exc:
+                for future in futures:
+                    future.set_exception(exc)
+                continue
+            for future in futures:
+                future.set_result(None)
+
+_group_writer: Optional[GroupCommitWriter] = None
+_group_writer_lock = threading.Lock()
+
+def get_group_writer() -> GroupCommitWriter:
+    """Return the process-wide group commit writer, creating it on first use."""
+    global _group_writer
+    with _group_writer_lock:
+        if _group_writer is None:
+            interval = float(os.getenv("TODO_GROUP_COMMIT_MS", "5")) / 1000
+            _group_writer = GroupCommitWriter(interval)
+            atexit.register(_group_writer.close)
+        return _group_writer
@@ -1,10 +1,16 @@
 """Core TodoList class implementation."""
 
+import heapq
 import json
 import os
-from datetime import datetime
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .storage import DurabilityMode, GroupCommitWriter, get_group_writer, write_atomic
 
 class TaskStatus(Enum):
     """Enumeration of possible task statuses."""
@@ -16,12 +22,125 @@ class TaskStatus(Enum):
     def __str__(self):
         return self.value
 
+# Fields every task carries, in the order they are stored
+TASK_FIELDS = ('id', 'title', 'description', 'status', 'created_at', 'modified_at', 'completed_at',
+               'priority', 'due_at')
+
+# Statuses of tasks that can be picked up next
+ACTIONABLE_STATUSES = frozenset({TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value})
+
+class Unset(Enum):
+    """Marker for optional update arguments that were not given."""
+    UNSET = "unset"
+
+# Default for update_task fields where None means "clear"; an Enum so it survives pickling
+UNSET = Unset.UNSET
+
+def _next_key(task: Dict) -> Tuple:
+    """Ordering key for next-up tasks: priority, then due date, then age.
+
+    Lower priority numbers come first and tasks without a priority or due
+    date sort after those that have one. The ID keeps keys unique.
+    """
+    priority = task.get('priority')
+    due_at = task.get('due_at')
+    return (priority is None, priority or 0, due_at is None, due_at or '',
+            task['created_at'], task['id'])
+
+def _normalize_due_at(due_at: Optional[str]) -> Optional[str]:
+    """Validate an ISO 8601 due date and return it in canonical UTC form.
+
+    Dates without an offset are taken to be UTC. Storing every due date in
+    UTC keeps the string comparison in ``_next_key`` chronological.
+    """
+    if due_at is None:
+        return None
+    parsed = datetime.fromisoformat(due_at)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+class FrozenTask(dict):
+    """Read-only task dict, shared unchanged between snapshots.
+
+    It is still a dict, so it encodes as JSON without conversion. Use
+    ``dict(task)`` to get a mutable copy.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Tasks in a snapshot are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenTask, (dict(self),))
+
+class TaskSnapshot(NamedTuple):
+    """Immutable, versioned view of a TodoList.
+
+    ``next_heap`` is a heap of next-up keys. A key only counts while it is
+    still the task's entry in ``next_keys``; stale keys are skipped by
+    readers and dropped when the heap is rebuilt.
+    """
+    version: int
+    tasks: Tuple[FrozenTask, ...]
+    by_id: Mapping[int, FrozenTask]
+    next_heap: Tuple[Tuple, ...]
+    next_keys: Mapping[int, Tuple]
+
+def _build_snapshot(tasks: Iterable[Dict], version: int) -> TaskSnapshot:
+    """Build a snapshot, and its next-up index, from scratch."""
+    by_id: Dict[int, FrozenTask] = {}
+    duplicates = []
+    for task in tasks:
+        if task['id'] in by_id:
+            duplicates.append(task)
+        else:
+            by_id[task['id']] = FrozenTask(task)
+    # Older versions could reuse IDs after a delete; renumber rather than drop.
+    for task in duplicates:
+        task_id = max(by_id) + 1
+        by_id[task_id] = FrozenTask(task, id=task_id)
+    next_keys = {task_id: _next_key(task) for task_id, task in by_id.items()
+                 if task['status'] in ACTIONABLE_STATUSES}
+    heap = list(next_keys.values())
+    heapq.heapify(heap)
+    return TaskSnapshot(version, tuple(by_id.values()), MappingProxyType(by_id),
+                        tuple(heap), MappingProxyType(next_keys))
+
 class TodoList:
-    """Main TodoList class for managing tasks."""
+    """Main TodoList class for managing tasks.
+
+    The current state is an immutable TaskSnapshot. Readers take the
+    current snapshot without locking or copying. Writers hold a lock,
+    build the next version around the changed tasks, swap it in and save
+    it, so readers never see a half-applied update.
+    """
 
-    def __init__(self, tasks_file: str):
+    def __init__(self, tasks_file: str,
+                 durability: Union[str, DurabilityMode] = DurabilityMode.NONE,
+                 group_writer: Optional[GroupCommitWriter] = None):
         self.tasks_file = tasks_file
-        self.tasks: List[Dict] = self._load_tasks()
+        self.durability = DurabilityMode(durability)
+        self._group_writer = group_writer
+        self._pending_commit: Optional[Future] = None
+        self._write_lock = threading.Lock()
+        self._snapshot = _build_snapshot(self._load_tasks(), 0)
+
+    @property
+    def tasks(self) -> Tuple[FrozenTask, ...]:
+        """Tasks in the current snapshot."""
+        return self._snapshot.tasks
+
+    @tasks.setter
+    def tasks(self, tasks: Iterable[Dict]) -> None:
+        with self._write_lock:
+            self._snapshot = _build_snapshot(tasks, self._snapshot.version + 1)
+
+    def snapshot(self) -> TaskSnapshot:
+        """Return the current snapshot."""
+        return self._snapshot
 
     def _load_tasks(self) -> List[Dict]:
         """Load tasks from JSON file."""
@@ -31,43 +150,121 @@ class TodoList:
         return []
 
     def _save_tasks(self) -> None:
-        """Save tasks to JSON file."""
-        with open(self.tasks_file, 'w') as f:
-            json.dump(self.tasks, f, indent=2)
+        """Save the current snapshot to JSON file according to the durability mode."""
+        tasks = self._snapshot.tasks
+        if self.durability is DurabilityMode.GROUP:
+            # Snapshots are immutable, so the writer thread can encode this one later.
+            writer = self._group_writer or get_group_writer()
+            self._pending_commit = writer.submit(
+                self.tasks_file, lambda: json.dumps(tasks, indent=2).encode('utf-8'))
+        elif self.durability is DurabilityMode.PER_WRITE:
+            write_atomic(self.tasks_file, json.dumps(tasks, indent=2).encode('utf-8'))
+        else:
+            with open(self.tasks_file, 'w') as f:
+                json.dump(tasks, f, indent=2)
 
-    def _get_task_by_id(self, task_id: int) -> Optional[Dict]:
+    def commit_future(self) -> Future:
+        """Return a future that resolves once all saved changes are durable."""
+        if self._pending_commit is None:
+            done: Future = Future()
+            done.set_result(None)
+            return done
+        return self._pending_commit
+
+    def _get_task_by_id(self, task_id: int) -> Optional[FrozenTask]:
         """Get a task by its ID."""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                return task
-        return None
+        return self._snapshot.by_id.get(task_id)
 
     def _update_task_metadata(self, task: Dict) -> None:
         """Update task modification timestamp."""
         task['modified_at'] = datetime.now().isoformat()
 
-    def add_task(self, title: str, description: Optional[str] = None) -> Dict:
-        """Add a new task to the list."""
-        now = datetime.now().isoformat()
-        task = {
-            'id': len(self.tasks) + 1,
-            'title': title,
-            'description': description,
-            'status': TaskStatus.PENDING.value,
-            'created_at': now,
-            'modified_at': now,
-            'completed_at': None
-        }
-        self.tasks.append(task)
+    def _publish(self, changed: Sequence[Dict] = (), deleted: Sequence[int] = ()) -> None:
+        """Swap in the next snapshot with tasks changed or deleted, then save it.
+
+        Unchanged tasks are shared with the previous snapshot; only the
+        containers holding them are copied. Must hold the write lock.
+        """
+        old = self._snapshot
+        by_id = dict(old.by_id)
+        next_keys = dict(old.next_keys)
+        heap = list(old.next_heap)
+        for task_id in deleted:
+            del by_id[task_id]
+            next_keys.pop(task_id, None)
+        for task in changed:
+            task = FrozenTask(task)
+            by_id[task['id']] = task
+            if task['status'] not in ACTIONABLE_STATUSES:
+                next_keys.pop(task['id'], None)
+                continue
+            key = _next_key(task)
+            if next_keys.get(task['id']) != key:
+                next_keys[task['id']] = key
+                heapq.heappush(heap, key)
+        if len(heap) > 2 * len(next_keys) + 64:
+            heap = list(next_keys.values())
+            heapq.heapify(heap)
+
+        self._snapshot = TaskSnapshot(old.version + 1, tuple(by_id.values()),
+                                      MappingProxyType(by_id), tuple(heap),
+                                      MappingProxyType(next_keys))
         self._save_tasks()
-        return task
 
-    def list_tasks(self, status: Optional[str] = None, sort_by_status: bool = False) -> List[Dict]:
-        """List all tasks, optionally filtered by status and sorted."""
-        tasks = self.tasks.copy()
+    def add_task(self, title: str, description: Optional[str] = None,
+                 priority: Optional[int] = None, due_at: Optional[str] = None) -> Dict:
+        """Add a new task to the list."""
+        due_at = _normalize_due_at(due_at)
+        with self._write_lock:
+            now = datetime.now().isoformat()
+            task_id = max(self._snapshot.by_id, default=0) + 1
+            self._publish(changed=[{
+                'id': task_id,
+                'title': title,
+                'description': description,
+                'status': TaskStatus.PENDING.value,
+                'created_at': now,
+                'modified_at': now,
+                'completed_at': None,
+                'priority': priority,
+                'due_at': due_at
+            }])
+            return self._snapshot.by_id[task_id]
+
+    def next_tasks(self, k: int = 10) -> List[Dict]:
+        """Return the top k actionable tasks without sorting the whole list.
+
+        Walks the snapshot's heap best-first with a small frontier heap, so
+        the cost is O(k log n) plus any stale entries met along the way.
+        """
+        snapshot = self._snapshot
+        heap = snapshot.next_heap
+        result: List[Dict] = []
+        seen = set()
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(result) < k:
+            key, index = heapq.heappop(frontier)
+            task_id = key[-1]
+            if snapshot.next_keys.get(task_id) == key and task_id not in seen:
+                seen.add(task_id)
+                result.append(snapshot.by_id[task_id])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
+
+    def list_tasks(self, status: Optional[str] = None, sort_by_status: bool = False,
+                   fields: Optional[List[str]] = None) -> Sequence[Dict]:
+        """List all tasks, optionally filtered by status, sorted and projected to fields."""
+        if fields is not None:
+            unknown = set(fields) - set(TASK_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+
+        tasks: Sequence[Dict] = self._snapshot.tasks
         if status:
             tasks = [task for task in tasks if task['status'] == status]
-        
+
         if sort_by_status:
             status_order = {
                 TaskStatus.PENDING.value: 0,
@@ -75,40 +272,56 @@ class TodoList:
                 TaskStatus.COMPLETED.value: 2
             }
             tasks = sorted(tasks, key=lambda x: (status_order.get(x['status'], 999), x['created_at']))
+
+        if fields is not None:
+            tasks = [{field: task.get(field) for field in fields} for task in tasks]
         return tasks
 
-    def update_task(self, task_id: int, 
+    def update_task(self, task_id: int,
                    title: Optional[str] = None,
                    description: Optional[str] = None,
-                   status: Optional[Union[str, TaskStatus]] = None) -> Optional[Dict]:
-        """Update a task's attributes."""
-        task = self._get_task_by_id(task_id)
-        if not task:
-            return None
-
-        if title is not None:
-            task['title'] = title
-        if description is not None:
-            task['description'] = description
-        if status is not None:
-            status_value = status.value if isinstance(status, TaskStatus) else status
-            if status_value == TaskStatus.COMPLETED.value and task['status'] != TaskStatus.COMPLETED.value:
-                task['completed_at'] = datetime.now().isoformat()
-            task['status'] = status_value
-
-        self._update_task_metadata(task)
-        self._save_tasks()
-        return task
+                   status: Optional[Union[str, TaskStatus]] = None,
+                   priority: Union[int, None, Unset] = UNSET,
+                   due_at: Union[str, None, Unset] = UNSET) -> Optional[Dict]:
+        """Update a task's attributes.
+
+        Title, description and status are left alone when None. Priority and
+        due date are left alone when UNSET and cleared when None.
+        """
+        if due_at is not UNSET:
+            due_at = _normalize_due_at(due_at)
+        with self._write_lock:
+            current = self._get_task_by_id(task_id)
+            if not current:
+                return None
+
+            task = dict(current)
+            if title is not None:
+                task['title'] = title
+            if description is not None:
+                task['description'] = description
+            if status is not None:
+                status_value = status.value if isinstance(status, TaskStatus) else status
+                if status_value == TaskStatus.COMPLETED.value and task['status'] != TaskStatus.COMPLETED.value:
+                    task['completed_at'] = datetime.now().isoformat()
+                task['status'] = status_value
+            if priority is not UNSET:
+                task['priority'] = priority
+            if due_at is not UNSET:
+                task['due_at'] = due_at
+
+            self._update_task_metadata(task)
+            self._publish(changed=[task])
+            return self._snapshot.by_id[task_id]
 
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by its ID."""
-        task = self._get_task_by_id(task_id)
-        if task:
-            self.tasks.remove(task)
-            self._save_tasks()
+        with self._write_lock:
+            if task_id not in self._snapshot.by_id:
+                return False
+            self._publish(deleted=[task_id])
             return True
-        return False
 
     def mark_complete(self, task_id: int) -> Optional[Dict]:
         """Mark a task as complete."""
-        return self.update_task(task_id, status=TaskStatus.COMPLETED)
\ No newline at end of file
+        return self.update_task(task_id, status=TaskStatus.COMPLETED)
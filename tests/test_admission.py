@@ -0,0 +1,86 @@
+"""
+Tests for per-tenant admission control and load shedding.
+"""
+
+import pytest
+from src.admission import AdmissionController, AdmissionRejected, TokenBucket
+
+class FakeClock:
+    """Manually advanced clock for deterministic timing."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    """Create a fake clock starting at zero."""
+    return FakeClock()
+
+def test_token_bucket_refills_over_time(clock):
+    """Test that a drained bucket refills at its rate up to the burst size."""
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now = 10
+    assert bucket.level() == 2
+
+def test_rate_limit_is_per_tenant(clock):
+    """Test that one tenant exhausting its bucket does not affect another."""
+    admission = AdmissionController(rate=1, burst=1, clock=clock)
+    admission.release("noisy", admission.admit("noisy"))
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        admission.admit("noisy")
+    assert exc_info.value.reason == 'rate_limited'
+    assert exc_info.value.retry_after == 1
+    admission.admit("quiet")
+
+def test_tenant_concurrency_cap(clock):
+    """Test that in-flight mutations per tenant are capped."""
+    admission = AdmissionController(max_inflight_per_tenant=2, clock=clock)
+    started = admission.admit("tenant")
+    admission.admit("tenant")
+
+    with pytest.raises(AdmissionRejected):
+        admission.admit("tenant")
+    admission.release("tenant", started)
+    admission.admit("tenant")
+
+def test_global_shedding_on_queue_depth_and_latency(clock):
+    """Test that global thresholds shed every tenant and then recover."""
+    admission = AdmissionController(max_queue_depth=2, max_latency=0.1, clock=clock)
+    first = admission.admit("a")
+    admission.admit("b")
+    with pytest.raises(AdmissionRejected) as exc_info:
+        admission.admit("c")
+    assert exc_info.value.reason == 'queue_depth'
+
+    clock.now = 5
+    admission.release("a", first)
+    with pytest.raises(AdmissionRejected) as exc_info:
+        admission.admit("c")
+    assert exc_info.value.reason == 'latency'
+
+    stats = admission.stats()
+    assert stats['shed'] == {'rate_limited': 0, 'tenant_concurrency': 0,
+                             'queue_depth': 1, 'latency': 1}
+    assert stats['tenants']['c']['shed'] == 2
+
+def test_idle_tenants_are_pruned(clock):
+    """Test that idle tenants with full buckets are forgotten but busy ones are kept."""
+    admission = AdmissionController(rate=1, burst=1, prune_interval=10, clock=clock)
+    admission.release("idle", admission.admit("idle"))
+    with pytest.raises(AdmissionRejected):
+        admission.admit("idle")
+    admission.admit("busy")
+
+    clock.now = 10
+    stats = admission.stats()
+    assert list(stats['tenants']) == ["busy"]
+    assert stats['shed']['rate_limited'] == 1
@@ -0,0 +1,77 @@
+"""
+Tests for the HTTP behavior of the API.
+"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+from src import api
+from src.admission import AdmissionController
+from src.storage import DurabilityMode
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Create a test client serving tenants from a temporary directory."""
+    monkeypatch.setattr(api, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(api, 'DURABILITY', DurabilityMode.NONE)
+    monkeypatch.setattr(api, 'WORKERS', 0)
+    monkeypatch.setattr(api, 'tenant_todos', {})
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', "admin-secret")
+    monkeypatch.setattr(api, 'admission', AdmissionController())
+    return TestClient(api.app)
+
+def auth(client, tenant_id="tenant"):
+    """Return headers authenticating as a tenant."""
+    token = client.post("/token", params={"tenant_id": tenant_id}).json()['access_token']
+    return {"Authorization": f"Bearer {token}"}
+
+def test_rate_limited_mutations_get_429_with_retry_after(client, monkeypatch):
+    """Test that mutations over a tenant's rate are shed with Retry-After."""
+    monkeypatch.setattr(api, 'admission', AdmissionController(rate=0.5, burst=2))
+    headers = auth(client)
+
+    for _ in range(2):
+        assert client.post("/tasks", json={"title": "Task"}, headers=headers).status_code == 200
+    response = client.post("/tasks", json={"title": "Task"}, headers=headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert client.post("/tasks", json={"title": "Task"},
+                       headers=auth(client, "other")).status_code == 200
+
+def test_failed_mutation_releases_its_slot(client, monkeypatch):
+    """Test that a mutation that ends in 404 still releases its in-flight slot."""
+    admission = AdmissionController(max_inflight_per_tenant=1)
+    monkeypatch.setattr(api, 'admission', admission)
+    headers = auth(client)
+
+    for _ in range(3):
+        assert client.put("/tasks/99", json={"title": "Missing"}, headers=headers).status_code == 404
+    assert admission.stats()['inflight'] == 0
+
+def test_admission_metrics_require_admin_token(client, monkeypatch):
+    """Test that admission metrics are only served to operators."""
+    client.post("/tasks", json={"title": "Task"}, headers=auth(client))
+
+    assert client.get("/metrics/admission").status_code == 403
+    assert client.get("/metrics/admission", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.get("/metrics/admission", headers={"X-Admin-Token": "admin-secret"})
+    assert response.status_code == 200
+    assert response.json()['inflight'] == 0
+
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', None)
+    assert client.get("/metrics/admission", headers={"X-Admin-Token": "admin-secret"}).status_code == 403
+
+def test_update_clears_priority_and_due_date_only_when_null(client):
+    """Test that an explicit null clears a field and an omitted one is kept."""
+    headers = auth(client)
+    task = client.post("/tasks", json={"title": "Task", "priority": 1,
+                                       "due_at": "2030-01-01T00:00:00Z"}, headers=headers).json()
+
+    kept = client.put(f"/tasks/{task['id']}", json={"title": "Renamed"}, headers=headers).json()
+    assert (kept['priority'], kept['due_at']) == (1, "2030-01-01T00:00:00+00:00")
+    cleared = client.put(f"/tasks/{task['id']}", json={"priority": None, "due_at": None},
+                         headers=headers).json()
+    assert (cleared['priority'], cleared['due_at']) == (None, None)
@@ -0,0 +1,70 @@
+"""
+Tests for the response compression middleware.
+"""
+
+import asyncio
+import gzip
+import pytest
+from src import compression
+from src.compression import CompressionMiddleware
+
+def make_app(body, more_body=False):
+    """Create a minimal ASGI app that returns body as JSON."""
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+        if more_body:
+            await send({'type': 'http.response.body', 'body': b''})
+    return app
+
+def call(app, accept_encoding=None):
+    """Run an HTTP request through app and return its headers and body."""
+    headers = [(b'accept-encoding', accept_encoding.encode())] if accept_encoding else []
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({'type': 'http', 'headers': headers}, receive, send))
+    response_headers = dict(messages[0]['headers'])
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return response_headers, body
+
+def test_gzip_above_threshold(monkeypatch):
+    """Test that large bodies are gzipped with updated headers."""
+    monkeypatch.setattr(compression, 'brotli', None)
+    payload = b'[' + b'{"id": 1, "title": "Task"},' * 100 + b'{}]'
+    headers, body = call(CompressionMiddleware(make_app(payload), minimum_size=100),
+                         'gzip, br')
+
+    assert headers[b'content-encoding'] == b'gzip'
+    assert headers[b'content-length'] == str(len(body)).encode()
+    assert headers[b'vary'] == b'Accept-Encoding'
+    assert gzip.decompress(body) == payload
+
+def test_brotli_preferred_when_available():
+    """Test that brotli is used when installed and accepted."""
+    brotli = pytest.importorskip('brotli')
+    payload = b'x' * 2000
+    headers, body = call(CompressionMiddleware(make_app(payload)), 'gzip, br')
+
+    assert headers[b'content-encoding'] == b'br'
+    assert brotli.decompress(body) == payload
+
+@pytest.mark.parametrize("accept_encoding, payload, more_body", [
+    (None, b'x' * 2000, False),
+    ('gzip;q=0', b'x' * 2000, False),
+    ('gzip', b'small', False),
+    ('gzip', b'x' * 2000, True),
+])
+def test_passthrough(accept_encoding, payload, more_body):
+    """Test that small, streamed or unaccepted responses are not compressed."""
+    headers, body = call(CompressionMiddleware(make_app(payload, more_body)), accept_encoding)
+
+    assert b'content-encoding' not in headers
+    assert body == payload
@@ -0,0 +1,93 @@
+"""
+Tests for the durability modes used when saving tasks.
+"""
+
+import json
+import os
+import threading
+import time
+import pytest
+from src.storage import DurabilityMode, GroupCommitWriter
+from src.todo_list import TodoList
+
+@pytest.mark.parametrize("mode", list(DurabilityMode))
+def test_tasks_persist_in_every_mode(temp_tasks_file, mode):
+    """Test that each durability mode writes tasks that can be reloaded."""
+    writer = GroupCommitWriter(interval=0.001)
+    todo_list = TodoList(temp_tasks_file, durability=mode, group_writer=writer)
+    todo_list.add_task("Task 1", "Description 1")
+    todo_list.add_task("Task 2")
+    todo_list.commit_future().result(timeout=5)
+    writer.close()
+
+    reloaded = TodoList(temp_tasks_file)
+    assert [task['title'] for task in reloaded.tasks] == ["Task 1", "Task 2"]
+
+def test_per_write_leaves_no_temp_files(tmp_path):
+    """Test that atomic writes clean up after the rename."""
+    tasks_file = str(tmp_path / "tasks.json")
+    todo_list = TodoList(tasks_file, durability="per-write")
+    todo_list.add_task("Task 1")
+
+    assert os.listdir(tmp_path) == ["tasks.json"]
+
+def test_group_commit_batches_tenants(tmp_path):
+    """Test that tenants dirtied together share one commit and see their own data."""
+    writer = GroupCommitWriter(interval=0.05)
+    lists = [TodoList(str(tmp_path / f"t{i}.json"), durability=DurabilityMode.GROUP,
+                      group_writer=writer) for i in range(3)]
+    for i, todo_list in enumerate(lists):
+        todo_list.add_task(f"Tenant {i}")
+        todo_list.add_task(f"Tenant {i} again")
+
+    futures = [todo_list.commit_future() for todo_list in lists]
+    for future in futures:
+        future.result(timeout=5)
+    writer.close()
+
+    for i in range(3):
+        with open(tmp_path / f"t{i}.json") as f:
+            assert [task['title'] for task in json.load(f)] == [f"Tenant {i}", f"Tenant {i} again"]
+
+def test_group_commit_writes_latest_snapshot(temp_tasks_file):
+    """Test that changes queued within one group are written as the latest version."""
+    writer = GroupCommitWriter(interval=0.05)
+    todo_list = TodoList(temp_tasks_file, durability=DurabilityMode.GROUP, group_writer=writer)
+    todo_list.add_task("Original")
+    first = todo_list.commit_future()
+    todo_list.update_task(1, title="Renamed")
+
+    assert todo_list.commit_future() is first
+    first.result(timeout=5)
+    writer.close()
+    assert TodoList(temp_tasks_file).tasks[0]['title'] == "Renamed"
+
+def test_group_writer_survives_unexpected_errors(tmp_path, monkeypatch):
+    """Test that an unexpected error fails its group without stopping the writer."""
+    writer = GroupCommitWriter(interval=0.001)
+    path = str(tmp_path / "tasks.json")
+    monkeypatch.setattr(writer, '_commit', lambda batch: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        writer.submit(path, lambda: b"[]").result(timeout=5)
+
+    monkeypatch.undo()
+    writer.submit(path, lambda: b"[]").result(timeout=5)
+    writer.close()
+    assert os.path.exists(path)
+
+def test_flush_waits_for_group_being_written(tmp_path):
+    """Test that flush also waits for the group the writer thread is committing."""
+    writer = GroupCommitWriter(interval=0.001)
+    path = str(tmp_path / "tasks.json")
+    started = threading.Event()
+
+    def slow_encode():
+        started.set()
+        time.sleep(0.2)
+        return b"[]"
+
+    future = writer.submit(path, slow_encode)
+    assert started.wait(5)
+    writer.flush()
+    assert future.done()
+    writer.close()
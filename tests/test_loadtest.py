@@ -0,0 +1,42 @@
+"""
+Tests for the load generator's scheduling and reporting helpers.
+"""
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from src.loadtest import (DEFAULT_MIX, DEFAULT_SIZES, build_report, make_schedule,
+                          make_tenants, parse_weights, percentile)
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0
+
+def test_schedule_is_reproducible():
+    """Test that the same seed produces the same tenants and schedule."""
+    def schedule(seed):
+        tenants = make_tenants(6, parse_weights(DEFAULT_SIZES), seed)
+        return [(tenant.tenant_id, tenant.bucket, op)
+                for tenant, op in make_schedule(tenants, 200, parse_weights(DEFAULT_MIX), seed)]
+
+    assert schedule(1) == schedule(1)
+    assert schedule(1) != schedule(2)
+
+def test_report_groups_by_route_and_bucket():
+    """Test that samples are summarized per route and per size bucket."""
+    samples = [
+        ('GET /tasks', 'small', 0.010, 200),
+        ('GET /tasks', 'large', 0.030, 200),
+        ('POST /tasks', 'large', 0.020, 429),
+    ]
+    report = build_report({'seed': 0}, samples, elapsed=1.0)
+
+    assert report['overall']['count'] == 3
+    assert report['routes']['GET /tasks']['p50_ms'] == pytest.approx(10)
+    assert report['buckets']['large']['status'] == {'200': 1, '429': 1}
+    assert set(report['buckets']['large']['routes']) == {'GET /tasks', 'POST /tasks'}
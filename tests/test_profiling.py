@@ -0,0 +1,113 @@
+"""
+Tests for on-demand profiling.
+"""
+
+import asyncio
+import os
+import pstats
+import time
+import pytest
+from src.profiling import ProfilerBusy, ProfilingMiddleware, profile
+
+def busy_work(seconds):
+    """Spin for the given number of seconds."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_pstats_profile_includes_todo_calls(tmp_path, temp_tasks_file):
+    """Test that a pstats profile captures loading and saving tasks."""
+    from src.todo_list import TodoList
+
+    with profile(str(tmp_path), "GET /tasks") as result:
+        todo_list = TodoList(temp_tasks_file)
+        todo_list.add_task("Profiled task")
+
+    assert result['path'].startswith(str(tmp_path / "GET_tasks-"))
+    assert result['path'].endswith(".prof")
+    functions = {name for _, _, name in pstats.Stats(result['path']).stats}
+    assert {'_load_tasks', '_save_tasks', 'dump'} <= functions
+
+def test_collapsed_profile_samples_stacks(tmp_path):
+    """Test that a collapsed profile records sampled stacks with counts."""
+    with profile(str(tmp_path), "cli-list", fmt='collapsed') as result:
+        busy_work(0.2)
+
+    assert result['path'].endswith(".folded")
+    with open(result['path']) as f:
+        lines = f.read().splitlines()
+    assert any('busy_work' in line for line in lines)
+    assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+
+def test_only_one_profile_at_a_time(tmp_path):
+    """Test that overlapping profiles are rejected."""
+    with profile(str(tmp_path), "first"):
+        with pytest.raises(ProfilerBusy):
+            with profile(str(tmp_path), "second"):
+                pass
+    with profile(str(tmp_path), "third") as result:
+        pass
+    assert result['path']
+
+def test_collapsed_profile_of_short_block_omits_sampler_frames(tmp_path):
+    """Test that a very short profile still has samples, none of them the sampler's own."""
+    with profile(str(tmp_path), "short", fmt='collapsed') as result:
+        pass
+
+    with open(result['path']) as f:
+        lines = f.read().splitlines()
+    assert any(line.startswith('MainThread;') for line in lines)
+    for line in lines:
+        assert '(profiling.py:' not in line
+        assert '(contextlib.py:' not in line
+        assert '_wait_for_tstate_lock' not in line
+
+async def hello_app(scope, receive, send):
+    """Minimal ASGI app that records the send callable it was given."""
+    scope['app_send'] = send
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'hello'})
+
+def call(middleware, headers):
+    """Send one GET request through middleware; return its scope and sent messages."""
+    scope = {'type': 'http', 'method': 'GET', 'path': '/tasks', 'headers': headers}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    scope['send'] = send
+    asyncio.run(middleware(scope, receive, send))
+    return scope, messages
+
+def test_middleware_passes_unprofiled_requests_straight_through(tmp_path):
+    """Test that requests without X-Profile, or without a configured token, are untouched."""
+    for token, headers in [("secret", []), (None, [(b'x-profile', b'secret')])]:
+        scope, messages = call(ProfilingMiddleware(hello_app, token, str(tmp_path)), headers)
+        assert scope['app_send'] is scope['send']
+        assert messages[0]['headers'] == []
+    assert os.listdir(tmp_path) == []
+
+def test_middleware_profiles_requests_with_admin_token(tmp_path):
+    """Test that a profiled response names its output file and scope."""
+    middleware = ProfilingMiddleware(hello_app, "secret", str(tmp_path))
+    _, messages = call(middleware, [(b'x-profile', b'secret'), (b'x-profile-format', b'collapsed')])
+
+    headers = dict(messages[0]['headers'])
+    assert headers[b'x-profile-scope'].startswith(b'process')
+    assert os.listdir(tmp_path) == [headers[b'x-profile-output'].decode()]
+    assert messages[1]['body'] == b'hello'
+
+def test_middleware_rejects_bad_tokens_and_overlapping_profiles(tmp_path):
+    """Test the 403, 400 and 409 responses of the profiling middleware."""
+    middleware = ProfilingMiddleware(hello_app, "secret", str(tmp_path))
+
+    assert call(middleware, [(b'x-profile', b'wrong')])[1][0]['status'] == 403
+    assert call(middleware, [(b'x-profile', b'secret'),
+                             (b'x-profile-format', b'svg')])[1][0]['status'] == 400
+    with profile(str(tmp_path), "running"):
+        assert call(middleware, [(b'x-profile', b'secret')])[1][0]['status'] == 409
+
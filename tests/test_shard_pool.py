@@ -0,0 +1,102 @@
+"""
+Tests for the tenant-sharded worker pool.
+"""
+
+import json
+import pytest
+from src.shard_pool import HashRing, ShardPool, ShardError
+
+def test_hash_ring_is_deterministic():
+    """Test that the same tenant always maps to the same shard."""
+    ring = HashRing(["shard-0", "shard-1", "shard-2"])
+    again = HashRing(["shard-0", "shard-1", "shard-2"])
+
+    assert all(ring.get_node(f"t{i}") == again.get_node(f"t{i}") for i in range(100))
+
+def test_hash_ring_growth_only_moves_to_new_node():
+    """Test that adding a node only moves tenants onto that node."""
+    before = HashRing(["shard-0", "shard-1", "shard-2"])
+    after = HashRing(["shard-0", "shard-1", "shard-2", "shard-3"])
+    tenants = [f"tenant{i}" for i in range(1000)]
+
+    moved = [t for t in tenants if before.get_node(t) != after.get_node(t)]
+    assert moved
+    assert len(moved) < len(tenants) / 2
+    assert all(after.get_node(t) == "shard-3" for t in moved)
+
+def test_pool_round_trip_and_resize(tmp_path):
+    """Test that tenants keep their tasks across pool resizes."""
+    pool = ShardPool(2, str(tmp_path))
+    try:
+        for i in range(8):
+            body = pool.submit(f"tenant{i}", 'add_task', f"Task for {i}").result(timeout=30)
+            assert json.loads(body)['title'] == f"Task for {i}"
+
+        pool.resize(3)
+        pool.resize(1)
+
+        for i in range(8):
+            tasks = json.loads(pool.submit(f"tenant{i}", 'list_tasks').result(timeout=30))
+            assert [task['title'] for task in tasks] == [f"Task for {i}"]
+        assert pool.submit("tenant0", 'delete_task', 99).result(timeout=30) == b"false"
+    finally:
+        pool.close()
+
+def test_pool_rejects_unknown_operations(tmp_path):
+    """Test that only TodoList operations can be forwarded to shards."""
+    pool = ShardPool(1, str(tmp_path))
+    try:
+        with pytest.raises(ValueError):
+            pool.submit("tenant", '_save_tasks')
+        with pytest.raises(ShardError):
+            pool.submit("tenant", 'mark_complete', 1, "extra").result(timeout=30)
+    finally:
+        pool.close()
+
+def test_resize_reports_tenants_from_removed_workers(tmp_path):
+    """Test that shrinking the pool reports tenants held by removed workers."""
+    pool = ShardPool(3, str(tmp_path))
+    try:
+        tenants = [f"tenant{i}" for i in range(12)]
+        for tenant in tenants:
+            pool.submit(tenant, 'add_task', "Task").result(timeout=30)
+        expected = {tenant for tenant in tenants if pool.shard_for(tenant) != "shard-0"}
+
+        assert set(pool.resize(1)) == expected
+    finally:
+        pool.close()
+
+def test_submit_queues_while_paused(tmp_path):
+    """Test that requests made during a resize are queued instead of blocking."""
+    pool = ShardPool(1, str(tmp_path))
+    try:
+        pool._pause()
+        future = pool.submit("tenant", 'add_task', "Queued")
+        assert not future.done()
+        pool._resume()
+        assert json.loads(future.result(timeout=30))['title'] == "Queued"
+    finally:
+        pool.close()
+
+def test_dead_worker_fails_cleanly_and_is_replaced(tmp_path):
+    """Test that a killed worker fails its requests without wedging the pool."""
+    pool = ShardPool(2, str(tmp_path))
+    try:
+        tenant = next(f"tenant{i}" for i in range(100) if pool.shard_for(f"tenant{i}") == "shard-0")
+        pool.submit(tenant, 'add_task', "Before crash").result(timeout=30)
+        dead = pool._shards["shard-0"]
+        dead.process.kill()
+        dead.process.join()
+
+        with pytest.raises(ShardError):
+            dead.call(-1, tenant, 'list_tasks', ()).result(timeout=30)
+        tasks = json.loads(pool.submit(tenant, 'list_tasks').result(timeout=30))
+        assert [task['title'] for task in tasks] == ["Before crash"]
+        assert pool._shards["shard-0"] is not dead
+
+        pool._shards["shard-1"].process.kill()
+        assert pool.resize(3) is not None
+        pool._shards["shard-2"].process.kill()
+    finally:
+        pool.close()
+    assert pool._inflight == 0
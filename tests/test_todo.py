@@ -2,9 +2,11 @@
 Tests for the todo list application's core functionality.
 """
 
+import argparse
 import pytest
 from datetime import datetime
 from src.todo import TodoList, TaskStatus
+from src.operations import AddTaskOperation, UpdateTaskOperation
 
 def test_add_task(todo_list):
     """Test adding a new task."""
@@ -128,4 +130,135 @@ def test_task_timestamps(todo_list):
     task = todo_list.update_task(task['id'], status=TaskStatus.COMPLETED)
     
     assert task['completed_at'] is not None
-    assert task['modified_at'] != created_at
\ No newline at end of file
+    assert task['modified_at'] != created_at
+
+def test_list_tasks_with_fields(populated_todo_list):
+    """Test projecting listed tasks to a subset of fields."""
+    tasks = populated_todo_list.list_tasks(fields=['id', 'title', 'status'])
+
+    assert tasks[0] == {'id': 1, 'title': "Task 1", 'status': TaskStatus.PENDING.value}
+    assert 'description' in populated_todo_list.tasks[0]
+
+def test_list_tasks_with_unknown_field(populated_todo_list):
+    """Test that projecting to an unknown field is rejected."""
+    with pytest.raises(ValueError):
+        populated_todo_list.list_tasks(fields=['id', 'secret'])
+
+def test_add_task_with_priority_and_due_date(todo_list):
+    """Test adding a task with a priority and due date."""
+    task = todo_list.add_task("Test Task", priority=2, due_at="2030-01-15")
+
+    assert task['priority'] == 2
+    assert task['due_at'] == "2030-01-15T00:00:00+00:00"
+    with pytest.raises(ValueError):
+        todo_list.add_task("Bad due date", due_at="next tuesday")
+
+def test_add_task_after_delete_uses_unique_id(populated_todo_list):
+    """Test that IDs are not reused by tasks added after a deletion."""
+    populated_todo_list.delete_task(1)
+    task = populated_todo_list.add_task("Task 4")
+
+    assert task['id'] == 4
+    assert len({task['id'] for task in populated_todo_list.tasks}) == 3
+
+def test_next_tasks_order(todo_list):
+    """Test that next tasks are ordered by priority, due date, then age."""
+    todo_list.add_task("No priority")
+    todo_list.add_task("Low priority", priority=5)
+    todo_list.add_task("High priority, due later", priority=1, due_at="2030-02-01")
+    todo_list.add_task("High priority, due sooner", priority=1, due_at="2030-01-01")
+    todo_list.add_task("High priority, no due date", priority=1)
+
+    titles = [task['title'] for task in todo_list.next_tasks(10)]
+    assert titles == [
+        "High priority, due sooner",
+        "High priority, due later",
+        "High priority, no due date",
+        "Low priority",
+        "No priority",
+    ]
+    assert [task['title'] for task in todo_list.next_tasks(2)] == titles[:2]
+
+def test_next_tasks_compare_due_dates_in_utc(todo_list):
+    """Test that due dates with different offsets, or none, are ordered by instant."""
+    todo_list.add_task("06:00 UTC", priority=1, due_at="2030-01-01T06:00:00+00:00")
+    todo_list.add_task("05:00 UTC", priority=1, due_at="2030-01-01T10:00:00+05:00")
+    todo_list.add_task("07:00 naive", priority=1, due_at="2030-01-01T07:00:00")
+    todo_list.add_task("04:30 UTC", priority=1, due_at="2029-12-31T23:30:00-05:00")
+
+    assert [task['title'] for task in todo_list.next_tasks(10)] == [
+        "04:30 UTC", "05:00 UTC", "06:00 UTC", "07:00 naive"]
+    assert todo_list.tasks[1]['due_at'] == "2030-01-01T05:00:00+00:00"
+
+def test_next_tasks_follow_mutations(todo_list):
+    """Test that updates, completions and deletions keep next tasks current."""
+    for i in range(1, 6):
+        todo_list.add_task(f"Task {i}", priority=i)
+    todo_list.mark_complete(1)
+    todo_list.update_task(2, status=TaskStatus.BACKLOG)
+    todo_list.delete_task(3)
+    todo_list.update_task(5, priority=0)
+    todo_list.update_task(5, title="Task 5 renamed")
+
+    assert [task['id'] for task in todo_list.next_tasks(10)] == [5, 4]
+    assert todo_list.next_tasks(1)[0]['title'] == "Task 5 renamed"
+
+def test_update_task_clears_priority_and_due_date(todo_list):
+    """Test that None clears priority and due date while omitting them keeps them."""
+    todo_list.add_task("Urgent", priority=1, due_at="2030-01-01")
+    todo_list.add_task("Normal", priority=2)
+
+    task = todo_list.update_task(1, title="Renamed")
+    assert (task['priority'], task['due_at']) == (1, "2030-01-01T00:00:00+00:00")
+    task = todo_list.update_task(1, priority=None, due_at=None)
+    assert (task['priority'], task['due_at']) == (None, None)
+    assert [task['title'] for task in todo_list.next_tasks(10)] == ["Normal", "Renamed"]
+
+def test_cli_update_clears_priority_and_due_date(todo_list):
+    """Test that --clear-priority and --clear-due remove those fields."""
+    operation = UpdateTaskOperation(todo_list)
+    parser = argparse.ArgumentParser()
+    operation.add_parser(parser.add_subparsers())
+    todo_list.add_task("Task", priority=1, due_at="2030-01-01")
+
+    operation.handle_args(parser.parse_args(['update', '1', '-t', 'Renamed']))
+    assert todo_list.tasks[0]['priority'] == 1
+    operation.handle_args(parser.parse_args(['update', '1', '--clear-priority', '--clear-due']))
+    assert (todo_list.tasks[0]['priority'], todo_list.tasks[0]['due_at']) == (None, None)
+
+def test_next_tasks_index_survives_reload(temp_tasks_file):
+    """Test that the next-up index is rebuilt from the tasks file."""
+    todo_list = TodoList(temp_tasks_file)
+    todo_list.add_task("Later", priority=3)
+    todo_list.add_task("Sooner", priority=1)
+
+    assert [task['title'] for task in TodoList(temp_tasks_file).next_tasks(1)] == ["Sooner"]
+
+def test_tasks_are_read_only(populated_todo_list):
+    """Test that tasks handed to readers cannot be mutated in place."""
+    task = populated_todo_list.list_tasks()[0]
+
+    with pytest.raises(TypeError):
+        task['title'] = "Changed"
+    assert dict(task)['title'] == "Task 1"
+
+def test_snapshot_unaffected_by_later_writes(populated_todo_list):
+    """Test that a snapshot keeps its version while writers publish new ones."""
+    before = populated_todo_list.snapshot()
+    populated_todo_list.update_task(1, title="Updated Title")
+    populated_todo_list.delete_task(2)
+    after = populated_todo_list.snapshot()
+
+    assert after.version == before.version + 2
+    assert [task['title'] for task in before.tasks] == ["Task 1", "Task 2", "Task 3"]
+    assert [task['title'] for task in after.tasks] == ["Updated Title", "Task 3"]
+    assert before.tasks[2] is after.tasks[1]
+
+def test_cli_rejects_invalid_due_date(capsys):
+    """Test that a malformed --due is a usage error rather than a traceback."""
+    parser = argparse.ArgumentParser()
+    AddTaskOperation(None).add_parser(parser.add_subparsers())
+    with pytest.raises(SystemExit) as exc_info:
+        parser.parse_args(['add', 'Task', '--due', 'next tuesday'])
+    assert exc_info.value.code == 2
+    assert "invalid ISO 8601 date" in capsys.readouterr().err